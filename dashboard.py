@@ -1,15 +1,72 @@
 #!/usr/bin/env python3
 
+import os
+import threading
+from collections import Counter
 import streamlit as st
 import sqlite3
 import pandas as pd
-import altair as alt
 
-def load_header_data(db_path='mach_o_binaries.db'):
+from machob_harvester import (
+    SCHEMA_VERSION,
+    magic_name,
+    cpu_type_name,
+    cpu_subtype_name,
+    file_type_name,
+    header_flag_names,
+)
+
+DB_PATH = 'mach_o_binaries.db'
+
+# Maximum number of rows sent to the browser for a single table
+DISPLAY_ROWS = 1000
+
+
+def db_mtime(db_path=DB_PATH):
+    """
+    Return the database file's modification time (0.0 if it doesn't exist).
+    Passed to the cached loaders so a re-harvested DB invalidates the cache.
+    """
+    return os.path.getmtime(db_path) if os.path.exists(db_path) else 0.0
+
+
+@st.cache_resource
+def conn_holder(db_path=DB_PATH):
+    """
+    Hold the open connection and the mtime it was opened at. Cached as a
+    resource because Streamlit reruns reset this module's globals.
+    """
+    return {"lock": threading.Lock(), "mtime": None, "conn": None}
+
+
+def get_conn(db_path=DB_PATH, mtime=None):
+    """
+    Return a single read-only connection to the database, shared by all loaders
+    across reruns instead of reconnecting for every query. It is reopened when
+    mtime changes, since `machob_harvester.py --memory` replaces the file with
+    a new one, and the previous connection is closed so it doesn't keep the
+    old file mapped.
+    """
+    holder = conn_holder(db_path)
+    with holder["lock"]:
+        if holder["conn"] is None or holder["mtime"] != mtime:
+            if holder["conn"] is not None:
+                holder["conn"].close()
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA cache_size=-100000")
+            holder["conn"] = conn
+            holder["mtime"] = mtime
+        return holder["conn"]
+
+
+@st.cache_data(show_spinner=False)
+def load_header_data(db_path=DB_PATH, mtime=None):
     """
     Load Mach-O header data into a DataFrame.
     """
-    conn = sqlite3.connect(db_path)
+    conn = get_conn(db_path, mtime)
     df = pd.read_sql_query(
         """
         SELECT h.id AS header_id,
@@ -27,46 +84,193 @@ def load_header_data(db_path='mach_o_binaries.db'):
         """,
         conn
     )
-    conn.close()
+
+    # The header fields are stored as raw integers; name each distinct value
+    # once, the way otool prints it, rather than decoding every row
+    subtype_names = {
+        (cputype, cpusubtype): cpu_subtype_name(cputype, cpusubtype)
+        for cputype, cpusubtype in
+        df[['cputype', 'cpusubtype']].drop_duplicates().itertuples(index=False)
+    }
+    df['cpusubtype'] = [subtype_names[key] for key in zip(df['cputype'], df['cpusubtype'])]
+    for col, name in (('magic', magic_name),
+                      ('cputype', cpu_type_name),
+                      ('filetype', file_type_name),
+                      ('flags', lambda flags: " ".join(header_flag_names(flags)))):
+        df[col] = df[col].map({value: name(value) for value in df[col].unique()})
+
+    # These columns only hold a handful of distinct values; categoricals make
+    # the groupbys and the pivot table below cheaper
+    for col in ('magic', 'cputype', 'cpusubtype', 'caps', 'filetype'):
+        df[col] = df[col].astype('category')
     return df
 
-def load_arm_instructions(db_path='mach_o_binaries.db'):
+def schema_version(db_path=DB_PATH, mtime=None):
     """
-    Load ARM64 instruction data into a DataFrame.
+    Return the schema version the harvester stamped on the database.
     """
-    conn = sqlite3.connect(db_path)
-    df_arm = pd.read_sql_query(
+    return get_conn(db_path, mtime).execute("PRAGMA user_version").fetchone()[0]
+
+@st.cache_data(show_spinner=False)
+def headline_metrics(db_path=DB_PATH, mtime=None):
+    """
+    Return (unique binaries, total headers, CPU types, file types,
+    distinct flags, distinct caps) in a single query.
+    """
+    conn = get_conn(db_path, mtime)
+    return conn.execute(
+        """
+        SELECT COUNT(DISTINCT b.path),
+               COUNT(*),
+               COUNT(DISTINCT h.cputype),
+               COUNT(DISTINCT h.filetype),
+               (SELECT COUNT(*) FROM flag_dim),
+               COUNT(DISTINCT h.caps)
+        FROM binary_header h
+        JOIN binary b ON h.binary_id = b.id
+        """
+    ).fetchone()
+
+@st.cache_data(show_spinner=False)
+def load_arm_frequency(db_path=DB_PATH, mtime=None):
+    """
+    Count ARM64 instructions per mnemonic, most frequent first.
+    """
+    conn = get_conn(db_path, mtime)
+    df_arm_freq = pd.read_sql_query(
+        """
+        SELECT d.name AS instruction,
+               f.count
+        FROM (
+            SELECT instruction_id,
+                   COUNT(*) AS count
+            FROM arm_asm_instructions
+            GROUP BY instruction_id
+        ) f
+        JOIN arm_instruction_dim d ON f.instruction_id = d.id
+        ORDER BY f.count DESC
+        """,
+        conn
+    )
+    return df_arm_freq
+
+@st.cache_data(show_spinner=False)
+def load_arm_metrics(db_path=DB_PATH, mtime=None):
+    """
+    Return (total instructions, distinct mnemonics, binaries with instructions).
+    """
+    conn = get_conn(db_path, mtime)
+    metrics = conn.execute(
+        """
+        SELECT COUNT(*),
+               COUNT(DISTINCT instruction_id),
+               (SELECT COUNT(DISTINCT path)
+                FROM binary
+                WHERE id IN (SELECT binary_id FROM arm_asm_instructions))
+        FROM arm_asm_instructions
+        """
+    ).fetchone()
+    return metrics
+
+@st.cache_data(show_spinner=False)
+def load_arm_sample(db_path=DB_PATH, mtime=None, n=50):
+    """
+    Pick `n` random ARM64 instruction rows and resolve their binary paths.
+    """
+    conn = get_conn(db_path, mtime)
+    df_sample = pd.read_sql_query(
         """
         SELECT a.id AS instr_id,
                b.path AS binary_path,
-               a.instruction
-        FROM arm_asm_instructions a
+               d.name AS instruction
+        FROM (
+            SELECT id, binary_id, instruction_id
+            FROM arm_asm_instructions
+            ORDER BY RANDOM()
+            LIMIT ?
+        ) a
         JOIN binary b ON a.binary_id = b.id
+        JOIN arm_instruction_dim d ON a.instruction_id = d.id
+        """,
+        conn,
+        params=(n,)
+    )
+    return df_sample
+
+@st.cache_data(show_spinner=False)
+def load_load_commands(db_path=DB_PATH, mtime=None):
+    """
+    Count load commands (e.g., LC_SEGMENT_64, LC_SYMTAB), most frequent first.
+    """
+    conn = get_conn(db_path, mtime)
+    df_load_freq = pd.read_sql_query(
+        """
+        SELECT command,
+               COUNT(*) AS count
+        FROM load_commands
+        GROUP BY command
+        ORDER BY count DESC
         """,
         conn
     )
-    conn.close()
-    return df_arm
+    return df_load_freq
 
-def load_load_commands(db_path='mach_o_binaries.db'):
+@st.cache_data(show_spinner=False)
+def binaries_missing_code_sig(db_path=DB_PATH, mtime=None):
     """
-    Load load-command data (e.g., LC_SEGMENT_64, LC_SYMTAB) into a DataFrame.
+    List the binaries that have load commands but no LC_CODE_SIGNATURE.
     """
-    conn = sqlite3.connect(db_path)
-    df_load = pd.read_sql_query(
+    conn = get_conn(db_path, mtime)
+    df_missing = pd.read_sql_query(
         """
-        SELECT lc.id AS load_cmd_id,
-               b.path AS binary_path,
-               lc.command,
-               lc.cmdsize,
-               lc.details
+        SELECT b.path AS binary_path
         FROM load_commands lc
         JOIN binary b ON lc.binary_id = b.id
+        EXCEPT
+        SELECT b.path
+        FROM load_commands lc
+        JOIN binary b ON lc.binary_id = b.id
+        WHERE lc.command = 'LC_CODE_SIGNATURE'
+        ORDER BY 1
         """,
         conn
     )
-    conn.close()
-    return df_load
+    return df_missing
+
+
+@st.cache_data(show_spinner=False)
+def count_flags(df):
+    """
+    Count occurrences of each space-separated header flag, most frequent first.
+    Only the distinct flag strings are split, weighted by how often they occur.
+    """
+    counts = Counter()
+    for flags, n in df['flags'].value_counts().items():
+        for flag in flags.split():
+            counts[flag] += n
+    return pd.DataFrame(counts.most_common(), columns=['flags_list', 'count'])
+
+
+@st.cache_data(show_spinner=False)
+def count_by(df, column):
+    """
+    Count rows per distinct value of `column`, most frequent first.
+    """
+    return df[column].value_counts().rename_axis(column).reset_index(name='count')
+
+def bar_spec(y, title, sort, height=300):
+    """
+    Vega-Lite spec for a horizontal bar chart of 'count' per `y`. Built as a
+    plain dict so reruns skip Altair's chart-to-spec conversion.
+    """
+    return {
+        "mark": "bar",
+        "encoding": {
+            "x": {"field": "count", "type": "quantitative", "title": "Count"},
+            "y": {"field": y, "type": "nominal", "sort": sort, "title": title},
+        },
+        "height": height,
+    }
 
 
 def main():
@@ -78,131 +282,137 @@ def main():
     )
     st.title("Mach-O Security Analysis Dashboard")
 
-    # Load main header data
-    df = load_header_data()
-    if df.empty:
+    if not os.path.exists(DB_PATH):
         st.warning("No Mach-O header data found.")
         return
+    mtime = db_mtime()
 
-    # Load ARM instruction data
-    df_arm = load_arm_instructions()
+    # The loaders expect the current layout (flag_dim, integer header fields)
+    if schema_version(DB_PATH, mtime) != SCHEMA_VERSION:
+        st.error(
+            f"{DB_PATH} was built by an older version of the harvester. "
+            "Delete it and run machob_harvester.py again."
+        )
+        return
+
+    (unique_binaries,
+     total_headers,
+     cpu_types,
+     file_types,
+     distinct_flags,
+     distinct_caps) = headline_metrics(DB_PATH, mtime)
+    if total_headers == 0:
+        st.warning("No Mach-O header data found.")
+        return
+
+    # Load main header data
+    df = load_header_data(DB_PATH, mtime)
+
+    # Let user choose how many entries each chart displays. The sliders sit in
+    # a form, so dragging them doesn't rerun the page until "Apply" is pressed
+    with st.sidebar.form("viz_params"):
+        st.header("Chart Settings")
+        num_top_flags = st.slider(
+            "Number of Most Common Flags to Display",
+            min_value=5, max_value=30, value=10, step=1
+        )
+        num_rare_flags = st.slider(
+            "Number of Rarest Flags to Display",
+            min_value=5, max_value=30, value=10, step=1
+        )
+        num_top_caps = st.slider(
+            "Number of Most Common Caps to Display",
+            min_value=5, max_value=30, value=10, step=1,
+            key="caps_top"
+        )
+        num_rare_caps = st.slider(
+            "Number of Rarest Caps to Display",
+            min_value=5, max_value=30, value=10, step=1,
+            key="caps_rare"
+        )
+        num_top_load_cmds = st.slider(
+            "Number of Most Common Load Commands to Display",
+            min_value=5, max_value=30, value=10, step=1
+        )
+        num_rare_load_cmds = st.slider(
+            "Number of Rarest Load Commands to Display",
+            min_value=5, max_value=30, value=10, step=1
+        )
+        num_top_instructions = st.slider(
+            "Number of Most Common Instructions to Display",
+            min_value=10, max_value=50, value=10, step=1
+        )
+        num_rare_instructions = st.slider(
+            "Number of Rarest Instructions to Display",
+            min_value=10, max_value=50, value=10, step=1
+        )
+        st.form_submit_button("Apply")
 
     # =======================================================
     # MACH-O HEADER ANALYSIS
     # =======================================================
-    df['flags_list'] = df['flags'].str.split()
-    df_flags = df.explode('flags_list').dropna(subset=['flags_list'])
-
     col0, col1, col2, col3, col4, col5 = st.columns(6)
-    col0.metric("Unique Binaries", str(df['binary_path'].nunique()))
-    col1.metric("Total Headers", str(len(df)))
-    col2.metric("CPU Types", str(df['cputype'].nunique()))
-    col3.metric("File Types", str(df['filetype'].nunique()))
-    col4.metric("Distinct Flags", str(df_flags['flags_list'].nunique()))
-    col5.metric("Distinct Caps", str(df['caps'].nunique()))
+    col0.metric("Unique Binaries", str(unique_binaries))
+    col1.metric("Total Headers", str(total_headers))
+    col2.metric("CPU Types", str(cpu_types))
+    col3.metric("File Types", str(file_types))
+    col4.metric("Distinct Flags", str(distinct_flags))
+    col5.metric("Distinct Caps", str(distinct_caps))
 
     st.subheader("Binaries Found")
-    df_display = df.drop(columns=['flags_list'], errors='ignore')
-    st.dataframe(df_display)
+    num_pages = (len(df) - 1) // DISPLAY_ROWS + 1
+    if num_pages > 1 and st.checkbox(f"Browse all {len(df)} headers"):
+        page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1)
+        start = (page - 1) * DISPLAY_ROWS
+        st.dataframe(df.iloc[start:start + DISPLAY_ROWS])
+    else:
+        st.dataframe(df.head(DISPLAY_ROWS))
 
     st.subheader("Flags Analysis")
-    flag_counts = (
-        df_flags
-        .groupby('flags_list')['header_id']
-        .count()
-        .reset_index(name='count')
-        .sort_values('count', ascending=False)
-    )
+    flag_counts = count_flags(df)
 
-    # Let user choose how many flags to display
-    num_top_flags = st.slider(
-        "Number of Most Common Flags to Display",
-        min_value=5, max_value=30, value=10, step=1
-    )
     top_flags = flag_counts.head(num_top_flags)
-
-    num_rare_flags = st.slider(
-        "Number of Rarest Flags to Display",
-        min_value=5, max_value=30, value=10, step=1
-    )
-    rare_flags = flag_counts.tail(num_rare_flags).sort_values('count', ascending=True)
+    rare_flags = flag_counts.iloc[-num_rare_flags:][::-1].reset_index(drop=True)
 
     c1, c2 = st.columns(2)
     with c1:
         st.markdown("**Most Common Flags**")
-        top_chart = (
-            alt.Chart(top_flags)
-            .mark_bar()
-            .encode(
-                x=alt.X('count:Q', title='Count'),
-                y=alt.Y('flags_list:N', sort='-x', title='Flag')
-            )
-            .properties(height=300)
+        st.vega_lite_chart(
+            top_flags,
+            bar_spec('flags_list', 'Flag', sort='-x'),
+            use_container_width=True
         )
-        st.altair_chart(top_chart, use_container_width=True)
 
     with c2:
         st.markdown("**Rarest Flags**")
-        rare_chart = (
-            alt.Chart(rare_flags)
-            .mark_bar()
-            .encode(
-                x=alt.X('count:Q', title='Count'),
-                y=alt.Y('flags_list:N', sort='x', title='Flag')
-            )
-            .properties(height=300)
+        st.vega_lite_chart(
+            rare_flags,
+            bar_spec('flags_list', 'Flag', sort='x'),
+            use_container_width=True
         )
-        st.altair_chart(rare_chart, use_container_width=True)
 
     st.subheader("Caps Analysis")
-    caps_count = (
-        df.groupby('caps')['header_id']
-        .count()
-        .reset_index(name='count')
-        .sort_values('count', ascending=False)
-    )
+    caps_count = count_by(df, 'caps')
 
-    # Similar approach for caps
-    num_top_caps = st.slider(
-        "Number of Most Common Caps to Display",
-        min_value=5, max_value=30, value=10, step=1,
-        key="caps_top"
-    )
     top_caps = caps_count.head(num_top_caps)
-
-    num_rare_caps = st.slider(
-        "Number of Rarest Caps to Display",
-        min_value=5, max_value=30, value=10, step=1,
-        key="caps_rare"
-    )
-    rare_caps = caps_count.tail(num_rare_caps).sort_values('count', ascending=True)
+    rare_caps = caps_count.iloc[-num_rare_caps:][::-1].reset_index(drop=True)
 
     c3, c4 = st.columns(2)
     with c3:
         st.markdown("**Most Common Caps**")
-        top_caps_chart = (
-            alt.Chart(top_caps)
-            .mark_bar()
-            .encode(
-                x=alt.X('count:Q', title='Count'),
-                y=alt.Y('caps:N', sort='-x', title='Caps')
-            )
-            .properties(height=300)
+        st.vega_lite_chart(
+            top_caps,
+            bar_spec('caps', 'Caps', sort='-x'),
+            use_container_width=True
         )
-        st.altair_chart(top_caps_chart, use_container_width=True)
 
     with c4:
         st.markdown("**Rarest Caps**")
-        rare_caps_chart = (
-            alt.Chart(rare_caps)
-            .mark_bar()
-            .encode(
-                x=alt.X('count:Q', title='Count'),
-                y=alt.Y('caps:N', sort='x', title='Caps')
-            )
-            .properties(height=300)
+        st.vega_lite_chart(
+            rare_caps,
+            bar_spec('caps', 'Caps', sort='x'),
+            use_container_width=True
         )
-        st.altair_chart(rare_caps_chart, use_container_width=True)
 
     st.subheader("Load Commands (ncmds)")
     fewest_ncmds = df[['binary_path', 'ncmds']].sort_values('ncmds', ascending=True).head(10)
@@ -221,7 +431,8 @@ def main():
         columns='cputype',
         values='header_id',
         aggfunc='count',
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
     st.dataframe(pivot_ftype)
 
@@ -229,72 +440,39 @@ def main():
     # LOAD COMMANDS ANALYSIS
     # =======================================================
     st.title("Load Commands Analysis")
-    df_load = load_load_commands()
+    df_load_freq = load_load_commands(DB_PATH, mtime)
 
-    if df_load.empty:
+    if df_load_freq.empty:
         st.warning("No load command data found.")
     else:
-        # Summarize frequency of each load command
-        df_load_freq = (
-            df_load.groupby('command')
-            .size()
-            .reset_index(name='count')
-            .sort_values('count', ascending=False)
-        )
-
-        # Sliders for top/rare load commands
-        num_top_load_cmds = st.slider(
-            "Number of Most Common Load Commands to Display",
-            min_value=5, max_value=30, value=10, step=1
-        )
-        num_rare_load_cmds = st.slider(
-            "Number of Rarest Load Commands to Display",
-            min_value=5, max_value=30, value=10, step=1
-        )
-
         top_load_cmds = df_load_freq.head(num_top_load_cmds)
-        rare_load_cmds = df_load_freq.tail(num_rare_load_cmds).sort_values('count', ascending=True)
+        rare_load_cmds = df_load_freq.iloc[-num_rare_load_cmds:][::-1].reset_index(drop=True)
 
         col_l1, col_l2 = st.columns(2)
         with col_l1:
             st.markdown("**Most Common Load Commands**")
-            top_load_cmds_chart = (
-                alt.Chart(top_load_cmds)
-                .mark_bar()
-                .encode(
-                    x=alt.X('count:Q', title='Count'),
-                    y=alt.Y('command:N', sort='-x', title='Load Command')
-                )
-                .properties(height=300)
+            st.vega_lite_chart(
+                top_load_cmds,
+                bar_spec('command', 'Load Command', sort='-x'),
+                use_container_width=True
             )
-            st.altair_chart(top_load_cmds_chart, use_container_width=True)
 
         with col_l2:
             st.markdown("**Rarest Load Commands**")
-            rare_load_cmds_chart = (
-                alt.Chart(rare_load_cmds)
-                .mark_bar()
-                .encode(
-                    x=alt.X('count:Q', title='Count'),
-                    y=alt.Y('command:N', sort='x', title='Load Command')
-                )
-                .properties(height=300)
+            st.vega_lite_chart(
+                rare_load_cmds,
+                bar_spec('command', 'Load Command', sort='x'),
+                use_container_width=True
             )
-            st.altair_chart(rare_load_cmds_chart, use_container_width=True)
 
         st.subheader("Binaries Missing LC_CODE_SIGNATURE")
-        # Binaries that have LC_CODE_SIGNATURE
-        binaries_with_code_sig = df_load.loc[
-            df_load['command'] == 'LC_CODE_SIGNATURE', 'binary_path'
-        ].unique()
-        # All binaries found in the load_commands table
-        all_binaries_loadcmd = df_load['binary_path'].unique()
-
-        missing_code_sig = sorted(set(all_binaries_loadcmd) - set(binaries_with_code_sig))
-        st.write(f"Found {len(missing_code_sig)} binaries missing LC_CODE_SIGNATURE:")
-
-        if missing_code_sig:
-            st.table(pd.DataFrame({'binary_path': missing_code_sig}))
+        df_missing = binaries_missing_code_sig(DB_PATH, mtime)
+        st.write(f"Found {len(df_missing)} binaries missing LC_CODE_SIGNATURE:")
+
+        if not df_missing.empty:
+            st.dataframe(df_missing.head(DISPLAY_ROWS))
+            if len(df_missing) > DISPLAY_ROWS:
+                st.caption(f"Showing the first {DISPLAY_ROWS} binaries.")
         else:
             st.info("All binaries have LC_CODE_SIGNATURE.")
 
@@ -303,72 +481,47 @@ def main():
     # =======================================================
     st.title("ARM64 Instructions Analysis")
 
+    # High-level metrics
+    (total_instructions,
+     distinct_instructions,
+     distinct_binaries_with_instructions) = load_arm_metrics(DB_PATH, mtime)
+
     # If no instructions, show a warning and bail out early
-    if df_arm.empty:
+    if total_instructions == 0:
         st.warning("No ARM64 instruction data found.")
         return
 
-    # High-level metrics
-    total_instructions = len(df_arm)  # total rows
-    distinct_instructions = df_arm['instruction'].nunique()
-    distinct_binaries_with_instructions = df_arm['binary_path'].nunique()
-
     colA, colB, colC = st.columns(3)
     colA.metric("Total ARM64 Instructions Logged", str(total_instructions))
     colB.metric("Distinct Instruction Mnemonics", str(distinct_instructions))
     colC.metric("Binaries with ARM64 Instructions", str(distinct_binaries_with_instructions))
 
     # Frequency of instructions
-    df_arm_freq = (
-        df_arm.groupby('instruction')
-        .size()
-        .reset_index(name='count')
-        .sort_values('count', ascending=False)
-    )
-
-    # Add sliders so we can control how many instructions to display
-    num_top_instructions = st.slider(
-        "Number of Most Common Instructions to Display",
-        min_value=10, max_value=50, value=10, step=1
-    )
-    num_rare_instructions = st.slider(
-        "Number of Rarest Instructions to Display",
-        min_value=10, max_value=50, value=10, step=1
-    )
+    df_arm_freq = load_arm_frequency(DB_PATH, mtime)
 
     top_instructions = df_arm_freq.head(num_top_instructions)
-    rare_instructions = df_arm_freq.tail(num_rare_instructions).sort_values('count', ascending=True)
+    rare_instructions = df_arm_freq.iloc[-num_rare_instructions:][::-1].reset_index(drop=True)
 
     st.subheader("ARM64 Instruction Distribution")
     col7, col8 = st.columns(2)
     with col7:
         st.markdown("**Most Common Instructions**")
-        top_instr_chart = (
-            alt.Chart(top_instructions)
-            .mark_bar()
-            .encode(
-                x=alt.X('count:Q', title='Count'),
-                y=alt.Y('instruction:N', sort='-x', title='Instruction')
-            )
-            .properties(height=400)   # Increase chart height as desired
+        st.vega_lite_chart(
+            top_instructions,
+            bar_spec('instruction', 'Instruction', sort='-x', height=400),
+            use_container_width=True
         )
-        st.altair_chart(top_instr_chart, use_container_width=True)
 
     with col8:
         st.markdown("**Rarest Instructions**")
-        rare_instr_chart = (
-            alt.Chart(rare_instructions)
-            .mark_bar()
-            .encode(
-                x=alt.X('count:Q', title='Count'),
-                y=alt.Y('instruction:N', sort='x', title='Instruction')
-            )
-            .properties(height=400)   # Increase chart height as desired
+        st.vega_lite_chart(
+            rare_instructions,
+            bar_spec('instruction', 'Instruction', sort='x', height=400),
+            use_container_width=True
         )
-        st.altair_chart(rare_instr_chart, use_container_width=True)
 
     st.subheader("ARM64 Instructions - Sample Data")
-    st.dataframe(df_arm.sample(min(len(df_arm), 50)))  # show up to 50 random rows
+    st.dataframe(load_arm_sample(DB_PATH, mtime))  # show up to 50 random rows
 
 
 if __name__ == "__main__":
@@ -2,62 +2,204 @@
 
 import os
 import re
+import mmap
+import struct
 import subprocess
 import sqlite3
 import argparse
+import multiprocessing
+import queue
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import closing
+from itertools import islice
+
+# Optional: disassemble ARM64 code in-process instead of spawning otool
+try:
+    import capstone
+    # Capstone 6 renamed CS_ARCH_ARM64 to CS_ARCH_AARCH64
+    CS_ARCH_ARM64 = getattr(capstone, "CS_ARCH_AARCH64", None)
+    if CS_ARCH_ARM64 is None:
+        CS_ARCH_ARM64 = capstone.CS_ARCH_ARM64
+except ImportError:
+    capstone = None
 
-# 1. Initialize or open the SQLite database
 DB_PATH = 'mach_o_binaries.db'
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
-
-# 2. Create or ensure existing tables
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS binary (
-        id   INTEGER PRIMARY KEY AUTOINCREMENT,
-        path TEXT NOT NULL
-    )
-''')
-
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS binary_header (
-        id          INTEGER PRIMARY KEY AUTOINCREMENT,
-        binary_id   INTEGER NOT NULL,
-        magic       TEXT,
-        cputype     TEXT,
-        cpusubtype  TEXT,
-        caps        TEXT,
-        filetype    TEXT,
-        ncmds       INTEGER,
-        sizeofcmds  INTEGER,
-        flags       TEXT,
-        FOREIGN KEY (binary_id) REFERENCES binary (id)
-    )
-''')
-
-# New table to store ARM64 instructions
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS arm_asm_instructions (
-        id          INTEGER PRIMARY KEY AUTOINCREMENT,
-        binary_id   INTEGER NOT NULL,
-        instruction TEXT,
-        FOREIGN KEY (binary_id) REFERENCES binary (id)
-    )
-''')
-
-# NEW: Table for load commands
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS load_commands (
-        id         INTEGER PRIMARY KEY AUTOINCREMENT,
-        binary_id  INTEGER NOT NULL,
-        command    TEXT,
-        cmdsize    TEXT,
-        details    TEXT,
-        FOREIGN KEY (binary_id) REFERENCES binary (id)
-    )
-''')
 
-conn.commit()
+# The connection only ever lives in the main process; extraction workers
+# spawned by walk_directory() never touch the database.
+conn = None
+cursor = None
+
+# Layout of the tables created by init_db(), stored in PRAGMA user_version.
+# Bump it whenever a table changes, so an older database is refused instead
+# of having rows in the new layout appended to it.
+#   1: arm_instruction_dim and flag_dim, and binary_header's magic, cputype,
+#      cpusubtype, filetype and flags stored as integers
+SCHEMA_VERSION = 1
+
+# walk_directory() hands the connection to a writer thread for the scan
+if sqlite3.threadsafety == 0:
+    raise RuntimeError("SQLite was built without thread support")
+
+
+def init_db(db_path=DB_PATH, in_memory=False):
+    """
+    Initialize or open the SQLite database and ensure the tables exist.
+    With in_memory, the scan is written to an in-memory copy of the database
+    instead, and save_db() writes it back to db_path once the scan is done.
+    """
+    global conn, cursor
+
+    # 1. Initialize or open the SQLite database
+    # Autocommit at the driver level: transactions are only the explicit
+    # BEGIN IMMEDIATE / COMMIT pairs issued around the scan
+    if in_memory:
+        conn = sqlite3.connect(":memory:", isolation_level=None, cached_statements=256,
+                               check_same_thread=False)
+        # Start from the existing database so a re-run still appends to it
+        if os.path.exists(db_path):
+            with closing(sqlite3.connect(db_path)) as source:
+                source.backup(conn)
+    else:
+        conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=256,
+                               check_same_thread=False)
+    cursor = conn.cursor()
+
+    (version,) = cursor.execute("PRAGMA user_version").fetchone()
+    (table_count,) = cursor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+    if table_count and version != SCHEMA_VERSION:
+        conn.close()
+        raise SystemExit(
+            f"{db_path} was built by an older version of the harvester "
+            f"(schema {version}, expected {SCHEMA_VERSION}); delete or rebuild it."
+        )
+
+    # Bulk-ingest settings: WAL with relaxed syncing and a 64 MB page cache.
+    # locking_mode stays NORMAL: EXCLUSIVE would skip the shared-memory
+    # index, but it would also lock the dashboard out for the whole scan.
+    # In WAL mode the dashboard keeps reading the last COMMIT_INTERVAL
+    # commit while the harvester writes.
+    cursor.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+    """)
+
+    # 2. Create or ensure existing tables
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS binary (
+            id   INTEGER PRIMARY KEY,
+            path TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS binary_header (
+            id          INTEGER PRIMARY KEY,
+            binary_id   INTEGER NOT NULL,
+            magic       INTEGER,
+            cputype     INTEGER,
+            cpusubtype  INTEGER,
+            caps        TEXT,
+            filetype    INTEGER,
+            ncmds       INTEGER,
+            sizeofcmds  INTEGER,
+            flags       INTEGER,
+            FOREIGN KEY (binary_id) REFERENCES binary (id)
+        )
+    ''')
+
+    # Distinct ARM64 instruction mnemonics, referenced by id
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS arm_instruction_dim (
+            id   INTEGER PRIMARY KEY,
+            name TEXT UNIQUE
+        )
+    ''')
+
+    # New table to store ARM64 instructions
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS arm_asm_instructions (
+            id             INTEGER PRIMARY KEY,
+            binary_id      INTEGER NOT NULL,
+            instruction_id INTEGER NOT NULL,
+            FOREIGN KEY (binary_id) REFERENCES binary (id),
+            FOREIGN KEY (instruction_id) REFERENCES arm_instruction_dim (id)
+        )
+    ''')
+
+    # Distinct header flags (e.g. PIE, TWOLEVEL) seen across all headers
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS flag_dim (
+            name TEXT PRIMARY KEY
+        )
+    ''')
+
+    # NEW: Table for load commands
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS load_commands (
+            id         INTEGER PRIMARY KEY,
+            binary_id  INTEGER NOT NULL,
+            command    TEXT,
+            cmdsize    TEXT,
+            details    TEXT,
+            FOREIGN KEY (binary_id) REFERENCES binary (id)
+        )
+    ''')
+
+    cursor.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+
+def create_indexes():
+    """
+    Create the indexes backing the dashboard's GROUP BY queries and binary
+    joins, and refresh the planner statistics. Called once the scan has been
+    committed, so the bulk inserts don't pay for B-tree updates.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_arm_instr ON arm_asm_instructions (instruction_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_arm_bin ON arm_asm_instructions (binary_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_lc_cmd ON load_commands (command)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_lc_bin ON load_commands (binary_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_hdr_bin ON binary_header (binary_id)")
+    cursor.execute("ANALYZE")
+
+
+def save_db(db_path=DB_PATH):
+    """
+    Write the in-memory database to db_path as a freshly packed file. The
+    snapshot goes to a temporary file that then replaces db_path, so readers
+    never see a half-written database.
+    """
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    cursor.execute("VACUUM INTO ?", (tmp_path,))
+
+    # A WAL left beside the old file would be replayed into the new one
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.replace(tmp_path, db_path)
+
+
+# First 4 bytes of a thin or fat Mach-O file, read as a big-endian integer;
+# both byte orders are listed so one read covers every variant
+MACH_O_MAGICS = frozenset((
+    0xFEEDFACE,  # MH_MAGIC
+    0xCEFAEDFE,  # MH_CIGAM
+    0xFEEDFACF,  # MH_MAGIC_64
+    0xCFFAEDFE,  # MH_CIGAM_64
+    0xCAFEBABE,  # FAT_MAGIC
+    0xBEBAFECA,  # FAT_CIGAM
+    0xCAFEBABF,  # FAT_MAGIC_64
+    0xBFBAFECA   # FAT_CIGAM_64
+))
+
+# Size of the smallest Mach-O header (32-bit mach_header); anything
+# shorter can't be a Mach-O file
+MIN_MACH_O_SIZE = 28
 
 
 def is_mach_o(file_path):
@@ -66,239 +208,813 @@ def is_mach_o(file_path):
     This isn’t foolproof, but is often sufficient.
     """
     try:
-        with open(file_path, 'rb') as f:
-            magic = f.read(4)
-        return magic in [
-            b'\xFE\xED\xFA\xCE',  # MH_MAGIC
-            b'\xCE\xFA\xED\xFE',  # MH_CIGAM
-            b'\xFE\xED\xFA\xCF',  # MH_MAGIC_64
-            b'\xCF\xFA\xED\xFE',  # MH_CIGAM_64
-            b'\xCA\xFE\xBA\xBE',  # FAT_MAGIC
-            b'\xBE\xBA\xFE\xCA',  # FAT_CIGAM
-            b'\xCA\xFE\xBA\xBF',  # FAT_MAGIC_64
-            b'\xBF\xBA\xFE\xCA'   # FAT_CIGAM_64
-        ]
-    except:
+        fd = os.open(file_path, os.O_RDONLY | os.O_NONBLOCK | os.O_NOFOLLOW)
+        try:
+            magic = os.pread(fd, 4, 0)
+        finally:
+            os.close(fd)
+    except OSError:
         return False
+    return int.from_bytes(magic, 'big') in MACH_O_MAGICS
+
+
+# Directories that never hold Mach-O worth indexing: VCS metadata, package
+# caches, and the signature folders of bundles. Bundle Resources folders are
+# still walked, since apps ship helper tools there; NON_BINARY_SUFFIXES keeps
+# their resource files from being opened.
+SKIP_DIRS = frozenset({
+    ".git", ".svn", "node_modules", "__pycache__", "_CodeSignature",
+})
 
 
-def get_mach_header_info(file_path):
+def iter_files(root_dir):
     """
-    Call 'otool -hv' and parse out the relevant fields:
-      magic, cputype, cpusubtype, caps, filetype, ncmds, sizeofcmds, flags
+    Yield an os.DirEntry for every regular file under root_dir. Directories
+    are walked from an explicit stack instead of nested generators, so each
+    entry is yielded straight to the caller whatever its depth.
+    Symlinks are not followed, and unreadable or SKIP_DIRS directories are
+    skipped.
     """
-    try:
-        cmd = ["otool", "-hv", file_path]
-        output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True)
-
-        lines = []
-        for line in output.splitlines():
-            line = line.strip()
-            # If line starts with 'MH_' or '0x', it's likely our data line
-            if re.match(r'(MH_|0x)', line):
-                lines.append(line)
-
-        headers_info = []
-        for hdr_line in lines:
-            parts = hdr_line.split()
-            if len(parts) < 7:
-                continue
-            magic = parts[0]
-            cputype = parts[1]
-            cpusubtype = parts[2]
-            caps = parts[3]
-            filetype = parts[4]
-            ncmds = parts[5]
-            sizeofcmds = parts[6]
-            flags = " ".join(parts[7:]) if len(parts) > 7 else ""
-            headers_info.append(
-                (magic, cputype, cpusubtype, caps, filetype, ncmds, sizeofcmds, flags)
-            )
-
-        return headers_info
-
-    except subprocess.CalledProcessError:
-        # Not a valid Mach-O or otool error
-        return []
+    stack = [root_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
 
 
-def get_arm64_instructions(file_path):
+# The magic-byte sniff is I/O-bound, so it runs on a thread pool to keep many
+# reads in flight; files are handed to it in batches as the walk yields them
+SNIFF_WORKERS = 32
+SNIFF_BATCH = 4096
+
+# Resource files that are never Mach-O, skipped without opening them
+NON_BINARY_SUFFIXES = ('.plist', '.nib', '.png', '.strings', '.icns', '.car', '.jpg')
+
+
+def sniff(entry):
     """
-    Call 'otool -arch arm64 -tV' to retrieve the assembly for ARM64.
-    Parse each line for the instruction mnemonic (e.g., 'mov', 'ldr', 'adr').
-    Return a list of instructions.
+    Return the directory entry if it looks like a Mach-O file, else None.
     """
+    if entry.name.endswith(NON_BINARY_SUFFIXES):
+        return None
+
+    # Skip files too small to hold a Mach-O header, or that vanished
     try:
-        cmd = ["otool", "-arch", "arm64", "-tV", file_path]
-        output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True)
-    except subprocess.CalledProcessError:
-        # Possibly not ARM64 or not a valid Mach-O
-        return []
-    except FileNotFoundError:
-        # 'otool' not found or other OS-level error
-        return []
+        if entry.stat(follow_symlinks=False).st_size < MIN_MACH_O_SIZE:
+            return None
+    except OSError:
+        return None
 
-    instructions = []
-    for line in output.splitlines():
-        # Typical line format:
-        # "0000000100003ae8    add    x0, x0, #0x100"
-        # We do a naive check for a leading address
-        line = line.strip()
-        if re.match(r'^[0-9A-Fa-f]+\s', line):
-            parts = line.split(None, 2)
-            if len(parts) >= 2:
-                instructions.append(parts[1])
+    return entry if is_mach_o(entry.path) else None
 
-    return instructions
 
+# Constants from <mach-o/loader.h> and <mach-o/fat.h>, used to parse Mach-O
+# headers and load commands directly instead of spawning otool for them
+MH_MAGIC = 0xFEEDFACE
+MH_CIGAM = 0xCEFAEDFE
+MH_MAGIC_64 = 0xFEEDFACF
+MH_CIGAM_64 = 0xCFFAEDFE
+FAT_MAGIC = 0xCAFEBABE
+FAT_CIGAM = 0xBEBAFECA
+FAT_MAGIC_64 = 0xCAFEBABF
+FAT_CIGAM_64 = 0xBFBAFECA
 
-def store_arm64_instructions(binary_id, instructions):
+CPU_SUBTYPE_MASK = 0xFF000000
+CPU_SUBTYPE_LIB64 = 0x80000000
+CPU_SUBTYPE_PTRAUTH_ABI = 0x80000000
+CPU_TYPE_ARM64 = 0x0100000C
+
+# Names as printed by 'otool -hv', so the stored values don't change
+CPU_TYPE_NAMES = {
+    7: "I386",
+    0x01000007: "X86_64",
+    12: "ARM",
+    CPU_TYPE_ARM64: "ARM64",
+    0x0200000C: "ARM64_32",
+    18: "PPC",
+    0x01000012: "PPC64",
+}
+
+CPU_SUBTYPE_NAMES = {
+    7: {3: "ALL"},
+    0x01000007: {3: "ALL", 8: "Haswell"},
+    12: {0: "ALL", 5: "V4T", 6: "V6", 7: "V5TEJ", 8: "XSCALE", 9: "V7", 10: "V7F",
+         11: "V7S", 12: "V7K", 13: "V8", 14: "V6M", 15: "V7M", 16: "V7EM"},
+    CPU_TYPE_ARM64: {0: "ALL", 1: "V8", 2: "E"},
+    0x0200000C: {0: "ALL", 1: "V8"},
+    18: {0: "ALL"},
+    0x01000012: {0: "ALL"},
+}
+
+FILE_TYPE_NAMES = {
+    1: "OBJECT",
+    2: "EXECUTE",
+    3: "FVMLIB",
+    4: "CORE",
+    5: "PRELOAD",
+    6: "DYLIB",
+    7: "DYLINKER",
+    8: "BUNDLE",
+    9: "DYLIB_STUB",
+    10: "DSYM",
+    11: "KEXT_BUNDLE",
+    12: "FILESET",
+}
+
+HEADER_FLAG_NAMES = (
+    (0x1, "NOUNDEFS"),
+    (0x2, "INCRLINK"),
+    (0x4, "DYLDLINK"),
+    (0x8, "BINDATLOAD"),
+    (0x10, "PREBOUND"),
+    (0x20, "SPLIT_SEGS"),
+    (0x40, "LAZY_INIT"),
+    (0x80, "TWOLEVEL"),
+    (0x100, "FORCE_FLAT"),
+    (0x200, "NOMULTIDEFS"),
+    (0x400, "NOFIXPREBINDING"),
+    (0x800, "PREBINDABLE"),
+    (0x1000, "ALLMODSBOUND"),
+    (0x2000, "SUBSECTIONS_VIA_SYMBOLS"),
+    (0x4000, "CANONICAL"),
+    (0x8000, "WEAK_DEFINES"),
+    (0x10000, "BINDS_TO_WEAK"),
+    (0x20000, "ALLOW_STACK_EXECUTION"),
+    (0x40000, "ROOT_SAFE"),
+    (0x80000, "SETUID_SAFE"),
+    (0x100000, "NO_REEXPORTED_DYLIBS"),
+    (0x200000, "PIE"),
+    (0x400000, "DEAD_STRIPPABLE_DYLIB"),
+    (0x800000, "HAS_TLV_DESCRIPTORS"),
+    (0x1000000, "NO_HEAP_EXECUTION"),
+    (0x2000000, "APP_EXTENSION_SAFE"),
+    (0x4000000, "NLIST_OUTOFSYNC_WITH_DYLDINFO"),
+    (0x8000000, "SIM_SUPPORT"),
+    (0x80000000, "DYLIB_IN_CACHE"),
+)
+
+LC_REQ_DYLD = 0x80000000
+LOAD_COMMAND_NAMES = {
+    0x1: "LC_SEGMENT",
+    0x2: "LC_SYMTAB",
+    0x3: "LC_SYMSEG",
+    0x4: "LC_THREAD",
+    0x5: "LC_UNIXTHREAD",
+    0x6: "LC_LOADFVMLIB",
+    0x7: "LC_IDFVMLIB",
+    0x8: "LC_IDENT",
+    0x9: "LC_FVMFILE",
+    0xA: "LC_PREPAGE",
+    0xB: "LC_DYSYMTAB",
+    0xC: "LC_LOAD_DYLIB",
+    0xD: "LC_ID_DYLIB",
+    0xE: "LC_LOAD_DYLINKER",
+    0xF: "LC_ID_DYLINKER",
+    0x10: "LC_PREBOUND_DYLIB",
+    0x11: "LC_ROUTINES",
+    0x12: "LC_SUB_FRAMEWORK",
+    0x13: "LC_SUB_UMBRELLA",
+    0x14: "LC_SUB_CLIENT",
+    0x15: "LC_SUB_LIBRARY",
+    0x16: "LC_TWOLEVEL_HINTS",
+    0x17: "LC_PREBIND_CKSUM",
+    0x18 | LC_REQ_DYLD: "LC_LOAD_WEAK_DYLIB",
+    0x19: "LC_SEGMENT_64",
+    0x1A: "LC_ROUTINES_64",
+    0x1B: "LC_UUID",
+    0x1C | LC_REQ_DYLD: "LC_RPATH",
+    0x1D: "LC_CODE_SIGNATURE",
+    0x1E: "LC_SEGMENT_SPLIT_INFO",
+    0x1F | LC_REQ_DYLD: "LC_REEXPORT_DYLIB",
+    0x20: "LC_LAZY_LOAD_DYLIB",
+    0x21: "LC_ENCRYPTION_INFO",
+    0x22: "LC_DYLD_INFO",
+    0x22 | LC_REQ_DYLD: "LC_DYLD_INFO_ONLY",
+    0x23 | LC_REQ_DYLD: "LC_LOAD_UPWARD_DYLIB",
+    0x24: "LC_VERSION_MIN_MACOSX",
+    0x25: "LC_VERSION_MIN_IPHONEOS",
+    0x26: "LC_FUNCTION_STARTS",
+    0x27: "LC_DYLD_ENVIRONMENT",
+    0x28 | LC_REQ_DYLD: "LC_MAIN",
+    0x29: "LC_DATA_IN_CODE",
+    0x2A: "LC_SOURCE_VERSION",
+    0x2B: "LC_DYLIB_CODE_SIGN_DRS",
+    0x2C: "LC_ENCRYPTION_INFO_64",
+    0x2D: "LC_LINKER_OPTION",
+    0x2E: "LC_LINKER_OPTIMIZATION_HINT",
+    0x2F: "LC_VERSION_MIN_TVOS",
+    0x30: "LC_VERSION_MIN_WATCHOS",
+    0x31: "LC_NOTE",
+    0x32: "LC_BUILD_VERSION",
+    0x33 | LC_REQ_DYLD: "LC_DYLD_EXPORTS_TRIE",
+    0x34 | LC_REQ_DYLD: "LC_DYLD_CHAINED_FIXUPS",
+    0x35 | LC_REQ_DYLD: "LC_FILESET_ENTRY",
+    0x36: "LC_ATOM_INFO",
+}
+
+# Load commands whose first field is an lc_str, and the label otool gives it
+LC_STR_LABELS = {
+    "LC_LOAD_DYLIB": "name",
+    "LC_ID_DYLIB": "name",
+    "LC_LOAD_WEAK_DYLIB": "name",
+    "LC_REEXPORT_DYLIB": "name",
+    "LC_LAZY_LOAD_DYLIB": "name",
+    "LC_LOAD_UPWARD_DYLIB": "name",
+    "LC_LOAD_DYLINKER": "name",
+    "LC_ID_DYLINKER": "name",
+    "LC_DYLD_ENVIRONMENT": "name",
+    "LC_RPATH": "path",
+}
+
+
+def mach_header_byte_order(image, offset):
     """
-    For a given binary ID, store the list of instructions into `arm_asm_instructions`.
+    Return the struct byte-order prefix of the thin Mach-O header at `offset`,
+    or None if there is no Mach-O magic there.
     """
-    for instr in instructions:
-        cursor.execute(
-            "INSERT INTO arm_asm_instructions (binary_id, instruction) VALUES (?, ?)",
-            (binary_id, instr)
-        )
-    conn.commit()
+    (magic,) = struct.unpack_from('<I', image, offset)
+    if magic in (MH_MAGIC, MH_MAGIC_64):
+        return '<'
+    if magic in (MH_CIGAM, MH_CIGAM_64):
+        return '>'
+    return None
 
 
-# NEW: Functions to collect and store load commands
-def get_load_commands(file_path):
+def iter_image_offsets(image):
     """
-    Call 'otool -l' to list load commands, parse out each 'Load command N'
-    block, and extract 'cmd', 'cmdsize', and the additional details.
+    Yield the offset of every thin Mach-O image in the file: 0 for a thin
+    file, or the offset of each slice listed in a fat file's fat_arch table.
     """
+    (magic,) = struct.unpack_from('>I', image, 0)
+    if magic in (FAT_MAGIC, FAT_MAGIC_64):
+        order = '>'
+    elif magic in (FAT_CIGAM, FAT_CIGAM_64):
+        order = '<'
+        magic = FAT_MAGIC_64 if magic == FAT_CIGAM_64 else FAT_MAGIC
+    else:
+        yield 0
+        return
+
+    (nfat_arch,) = struct.unpack_from(order + 'I', image, 4)
+    if magic == FAT_MAGIC_64:
+        arch_format, arch_size = order + 'iiQQII', 32
+    else:
+        arch_format, arch_size = order + 'iiIII', 20
+
+    for i in range(nfat_arch):
+        # Java class files share FAT_MAGIC; stop at the first bogus entry
+        arch_offset = 8 + i * arch_size
+        if arch_offset + arch_size > len(image):
+            return
+        slice_offset = struct.unpack_from(arch_format, image, arch_offset)[2]
+        if slice_offset + MIN_MACH_O_SIZE > len(image):
+            return
+        yield slice_offset
+
+
+def get_mach_header_info(image, offset=0):
+    """
+    Unpack the mach_header at `offset` into the raw integers stored in
+    `binary_header`:
+      magic, cputype, cpusubtype, caps, filetype, ncmds, sizeofcmds, flags
+    Only caps is rendered as text, the way 'otool -hv' prints it; the name
+    helpers below turn the other fields into otool's names for display.
+    Returns None if there is no thin Mach-O header at that offset.
+    """
+    order = mach_header_byte_order(image, offset)
+    if order is None:
+        return None
+
+    magic, cputype, cpusubtype, filetype, ncmds, sizeofcmds, flags = \
+        struct.unpack_from(order + '7I', image, offset)
+
+    if cputype == CPU_TYPE_ARM64 and cpusubtype & CPU_SUBTYPE_PTRAUTH_ABI:
+        caps = f"PAC{(cpusubtype & 0x0F000000) >> 24:02d}"
+    elif cpusubtype & CPU_SUBTYPE_MASK == CPU_SUBTYPE_LIB64:
+        caps = "LIB64"
+    else:
+        caps = f"0x{(cpusubtype & CPU_SUBTYPE_MASK) >> 24:02x}"
+
+    # The byte order is already resolved, so only the 32/64-bit magic is kept
+    magic = MH_MAGIC_64 if magic == MH_MAGIC_64 else MH_MAGIC
+
+    return (magic, cputype, cpusubtype, caps, filetype, ncmds, sizeofcmds, flags)
+
+
+# Render the stored header integers with the names otool prints, for display
+def magic_name(magic):
+    return "MH_MAGIC_64" if magic == MH_MAGIC_64 else "MH_MAGIC"
+
+
+def cpu_type_name(cputype):
+    return CPU_TYPE_NAMES.get(cputype, str(cputype))
+
+
+def cpu_subtype_name(cputype, cpusubtype):
+    subtype = cpusubtype & ~CPU_SUBTYPE_MASK
+    return CPU_SUBTYPE_NAMES.get(cputype, {}).get(subtype, str(subtype))
+
+
+def file_type_name(filetype):
+    return FILE_TYPE_NAMES.get(filetype, str(filetype))
+
+
+KNOWN_HEADER_FLAGS = sum(bit for bit, _ in HEADER_FLAG_NAMES)
+
+
+def header_flag_names(flags):
+    """
+    Name the bits set in a header's flags, with any unknown bits appended
+    as one hex value, as 'otool -hv' prints them.
+    """
+    names = [name for bit, name in HEADER_FLAG_NAMES if flags & bit]
+    unknown_flags = flags & ~KNOWN_HEADER_FLAGS
+    if unknown_flags:
+        names.append(f"0x{unknown_flags:08x}")
+    return names
+
+
+def read_c_string(image, start, end):
+    """
+    Read a NUL-terminated string from image[start:end].
+    """
+    raw = image[start:end]
+    return raw.split(b'\0', 1)[0].decode('utf-8', errors='replace')
+
+
+def get_load_commands(image, offset=0):
+    """
+    Walk the load_command chain of the thin Mach-O image at `offset` and
+    extract 'cmd', 'cmdsize', and a few details, laid out like 'otool -l'.
+    """
+    order = mach_header_byte_order(image, offset)
+    if order is None:
+        return []
+
+    magic, _, _, _, ncmds, _, _ = struct.unpack_from(order + '7I', image, offset)
+    cmd_offset = offset + (32 if magic == MH_MAGIC_64 else 28)
+
     commands = []
+    # A truncated command ends the walk, keeping the commands before it
     try:
-        output = subprocess.check_output(["otool", "-l", file_path],
-                                         stderr=subprocess.STDOUT,
-                                         text=True)
-        lines = output.splitlines()
-
-        current_load_cmd = None  # Start with None, so we know if we've hit a "Load command ..." line yet
-
-        for line in lines:
-            line = line.strip()
-
-            # Start of a load command block
-            if line.startswith("Load command"):
-                # If we already have a load command dict, store it first
-                if current_load_cmd is not None:
-                    commands.append(current_load_cmd)
-                # Create a new dict for the next block
-                current_load_cmd = {"command": "", "cmdsize": "", "details": []}
-
-            elif current_load_cmd is not None:
-                # We’re inside a load command block. Let’s parse known fields.
-                if line.startswith("cmd "):
-                    # e.g. 'cmd LC_SEGMENT_64'
-                    parts = line.split(maxsplit=1)
-                    if len(parts) == 2:
-                        current_load_cmd["command"] = parts[1]
-
-                elif line.startswith("cmdsize "):
-                    # e.g. 'cmdsize 72'
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        current_load_cmd["cmdsize"] = parts[1]
-
-                # Save everything as part of 'details'
-                current_load_cmd["details"].append(line)
-
-        # Append the last load command, if any
-        if current_load_cmd is not None:
-            commands.append(current_load_cmd)
-
-    except subprocess.CalledProcessError:
-        # If 'otool -l' fails, just return an empty list
+        for _ in range(ncmds):
+            cmd, cmdsize = struct.unpack_from(order + 'II', image, cmd_offset)
+            if cmdsize < 8 or cmd_offset + cmdsize > len(image):
+                # Malformed or truncated command; stop rather than loop forever
+                break
+
+            command = LOAD_COMMAND_NAMES.get(cmd, f"?(0x{cmd:08x})")
+            details = [f"cmd {command}", f"cmdsize {cmdsize}"]
+            cmd_end = cmd_offset + cmdsize
+
+            if command in ("LC_SEGMENT", "LC_SEGMENT_64"):
+                details.append(f"segname {read_c_string(image, cmd_offset + 8, cmd_offset + 24)}")
+            elif command == "LC_UUID":
+                uuid = image[cmd_offset + 8:cmd_offset + 24].hex().upper()
+                details.append(
+                    f"uuid {uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}"
+                )
+            elif command in LC_STR_LABELS:
+                (str_offset,) = struct.unpack_from(order + 'I', image, cmd_offset + 8)
+                value = read_c_string(image, cmd_offset + str_offset, cmd_end)
+                details.append(f"{LC_STR_LABELS[command]} {value} (offset {str_offset})")
+
+            commands.append({"command": command, "cmdsize": str(cmdsize), "details": details})
+            cmd_offset = cmd_end
+    except struct.error:
         pass
 
     return commands
 
 
+def parse_mach_o(file_path):
+    """
+    Map the file and parse its Mach-O header(s) and load commands in-process.
+    Headers are returned for every slice of a fat file; load commands only for
+    the ARM64 slice (or the first slice without one), like otool's default.
+    """
+    try:
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image:
+            headers_info = []
+            load_cmd_offset = None
+            for offset in iter_image_offsets(image):
+                try:
+                    header = get_mach_header_info(image, offset)
+                except struct.error:
+                    continue
+                if header is None:
+                    continue
+                headers_info.append(header)
+                if load_cmd_offset is None or header[1] == CPU_TYPE_ARM64:
+                    load_cmd_offset = offset
+
+            commands = []
+            if load_cmd_offset is not None:
+                commands = get_load_commands(image, load_cmd_offset)
+            return headers_info, commands
+    except (OSError, ValueError, struct.error):
+        # Unreadable, empty, or truncated file
+        return [], []
+
+
+# Disassembly line: leading address, then the mnemonic, e.g.
+# "0000000100003ae8    add    x0, x0, #0x100"
+ASM_LINE_RE = re.compile(r'\s*[0-9A-Fa-f]+\s+(\S+)')
+
+
+def find_section(image, offset, segname, sectname):
+    """
+    Look up a section in the thin Mach-O image at `offset`.
+    Return (file offset relative to the image, size, address), or None.
+    """
+    order = mach_header_byte_order(image, offset)
+    if order is None:
+        return None
+
+    magic, _, _, _, ncmds, _, _ = struct.unpack_from(order + '7I', image, offset)
+    is_64 = magic == MH_MAGIC_64
+    cmd_offset = offset + (32 if is_64 else 28)
+    segment_cmd = 0x19 if is_64 else 0x1
+    # segment_command(_64) and section(_64) layouts past their name fields
+    segment_format, segment_size = (order + 'QQQQiiII', 72) if is_64 else (order + 'IIIIiiII', 56)
+    section_format, section_size = (order + 'QQI', 80) if is_64 else (order + 'III', 68)
+
+    for _ in range(ncmds):
+        cmd, cmdsize = struct.unpack_from(order + 'II', image, cmd_offset)
+        if cmdsize < 8 or cmd_offset + cmdsize > len(image):
+            break
+        if cmd == segment_cmd and read_c_string(image, cmd_offset + 8, cmd_offset + 24) == segname:
+            nsects = struct.unpack_from(segment_format, image, cmd_offset + 24)[6]
+            # nsects comes from the file; only trust as many as fit in the command
+            nsects = min(nsects, max(cmdsize - segment_size, 0) // section_size)
+            sect_offset = cmd_offset + segment_size
+            for _ in range(nsects):
+                if read_c_string(image, sect_offset, sect_offset + 16) == sectname:
+                    addr, size, file_offset = struct.unpack_from(section_format, image, sect_offset + 32)
+                    return file_offset, size, addr
+                sect_offset += section_size
+        cmd_offset += cmdsize
+
+    return None
+
+
+def disassemble_arm64(file_path):
+    """
+    Disassemble the __TEXT,__text section of the file's ARM64 slice with
+    Capstone and return the instruction mnemonics.
+    """
+    try:
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image:
+            for offset in iter_image_offsets(image):
+                header = get_mach_header_info(image, offset)
+                if header is None or header[1] != CPU_TYPE_ARM64:
+                    continue
+                section = find_section(image, offset, "__TEXT", "__text")
+                if section is None:
+                    return []
+                file_offset, size, addr = section
+                start = offset + file_offset
+                md = capstone.Cs(CS_ARCH_ARM64, capstone.CS_MODE_LITTLE_ENDIAN)
+                # Keep going over data in code, like otool does
+                md.skipdata = True
+                return [
+                    mnemonic
+                    for _, _, mnemonic, _ in md.disasm_lite(image[start:start + size], addr)
+                ]
+    except (OSError, ValueError, struct.error):
+        pass
+    return []
+
+
+def get_arm64_instructions(file_paths):
+    """
+    Retrieve the instruction mnemonics (e.g., 'mov', 'ldr', 'adr') of the
+    ARM64 code of several files. Uses Capstone when it is installed;
+    otherwise runs a single 'otool -arch arm64 -tV' over all the files,
+    streaming its output so the full listing is never held in memory.
+    otool prints a '<path>:' line before each file's listing, which is used
+    to attribute the mnemonics that follow.
+    Return a dict mapping each path to its list of instructions.
+    """
+    if capstone is not None:
+        return {file_path: disassemble_arm64(file_path) for file_path in file_paths}
+
+    instructions = {file_path: [] for file_path in file_paths}
+    if not file_paths:
+        return instructions
+
+    labels = {}
+    for file_path in file_paths:
+        labels[f"{file_path}:"] = file_path
+        labels[f"{file_path} (architecture arm64):"] = file_path
+
+    cmd = ["otool", "-arch", "arm64", "-tV", *file_paths]
+    current = None
+    try:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              text=True, bufsize=1 << 20) as proc:
+            for line in proc.stdout:
+                # Label lines first: a path such as 'cafe babe/q' would also
+                # pass for an address followed by a mnemonic.
+                # Files otool can't disassemble (possibly not ARM64 or not a
+                # valid Mach-O) get no label line, so they keep no instructions
+                file_path = labels.get(line.rstrip('\n'))
+                if file_path is not None:
+                    current = instructions[file_path]
+                    continue
+
+                # We do a naive check for a leading address
+                match = ASM_LINE_RE.match(line)
+                if match and current is not None:
+                    current.append(match.group(1))
+    except FileNotFoundError:
+        # 'otool' not found or other OS-level error
+        pass
+
+    return instructions
+
+
+# Statements used by the writer, built once so every call binds parameters
+# to the exact same SQL text and reuses its prepared statement from the
+# connection's statement cache
+INSERT_BINARY_SQL = "INSERT INTO binary (id, path) VALUES (?, ?)"
+INSERT_HEADER_SQL = """
+    INSERT INTO binary_header (
+        binary_id,
+        magic,
+        cputype,
+        cpusubtype,
+        caps,
+        filetype,
+        ncmds,
+        sizeofcmds,
+        flags
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_INSTRUCTION_NAME_SQL = "INSERT OR IGNORE INTO arm_instruction_dim (name) VALUES (?)"
+SELECT_INSTRUCTION_ID_SQL = "SELECT id FROM arm_instruction_dim WHERE name = ?"
+INSERT_INSTRUCTION_SQL = "INSERT INTO arm_asm_instructions (binary_id, instruction_id) VALUES (?, ?)"
+INSERT_LOAD_COMMAND_SQL = """
+    INSERT INTO load_commands (binary_id, command, cmdsize, details)
+    VALUES (?, ?, ?, ?)
+"""
+INSERT_FLAG_SQL = "INSERT OR IGNORE INTO flag_dim (name) VALUES (?)"
+
+
+# Mnemonic -> arm_instruction_dim.id, filled lazily as mnemonics are seen
+instruction_ids = {}
+
+
+def get_instruction_id(instr):
+    """
+    Return the arm_instruction_dim id of a mnemonic, adding it if it's new.
+    """
+    instr_id = instruction_ids.get(instr)
+    if instr_id is None:
+        cursor.execute(INSERT_INSTRUCTION_NAME_SQL, (instr,))
+        cursor.execute(SELECT_INSTRUCTION_ID_SQL, (instr,))
+        instr_id = instruction_ids[instr] = cursor.fetchone()[0]
+    return instr_id
+
+
+def store_arm64_instructions(binary_id, instructions):
+    """
+    For a given binary ID, store the list of instructions into `arm_asm_instructions`.
+    """
+    cursor.executemany(
+        INSERT_INSTRUCTION_SQL,
+        [(binary_id, get_instruction_id(instr)) for instr in instructions]
+    )
+
+
+# NEW: Function to store load commands
 def store_load_commands(binary_id, commands):
     """
     For a given binary ID, store each load command in the 'load_commands' table.
     """
-    for cmd_info in commands:
-        command = cmd_info.get("command", "")
-        cmdsize = cmd_info.get("cmdsize", "")
-        # Join all details lines with a newline
-        details = "\n".join(cmd_info.get("details", []))
-        cursor.execute('''
-            INSERT INTO load_commands (binary_id, command, cmdsize, details)
-            VALUES (?, ?, ?, ?)
-        ''', (binary_id, command, cmdsize, details))
-
-    conn.commit()
-
-
-def process_file(file_path):
-    """
-    Insert the file path into `binary` and gather Mach-O header data
-    for insertion into `binary_header`. Also harvest ARM64 instructions
-    and load commands.
-    """
-    # Insert path into `binary` table
-    cursor.execute("INSERT INTO binary (path) VALUES (?)", (file_path,))
-    binary_id = cursor.lastrowid
-
-    # Insert Mach-O header info
-    header_list = get_mach_header_info(file_path)
-    for (magic, cputype, cpusubtype, caps, filetype, ncmds, sizeofcmds, flags) in header_list:
-        cursor.execute("""
-            INSERT INTO binary_header (
-                binary_id,
-                magic,
-                cputype,
-                cpusubtype,
-                caps,
-                filetype,
-                ncmds,
-                sizeofcmds,
-                flags
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    cursor.executemany(INSERT_LOAD_COMMAND_SQL, [
+        (
             binary_id,
-            magic,
-            cputype,
-            cpusubtype,
-            caps,
-            filetype,
-            int(ncmds) if ncmds.isdigit() else None,
-            int(sizeofcmds) if sizeofcmds.isdigit() else None,
-            flags
-        ))
-
-    conn.commit()
-
-    # Harvest ARM64 instructions (if applicable)
-    arm64_instructions = get_arm64_instructions(file_path)
+            cmd_info.get("command", ""),
+            cmd_info.get("cmdsize", ""),
+            # Join all details lines with a newline
+            "\n".join(cmd_info.get("details", []))
+        )
+        for cmd_info in commands
+    ])
+
+
+# Header flags already recorded in flag_dim
+known_flags = set()
+
+
+def store_flags(header_list):
+    """
+    Record any header flags not seen before into `flag_dim`.
+    """
+    new_flags = {
+        flag
+        for header in header_list
+        for flag in header_flag_names(header[7])
+    } - known_flags
+    if new_flags:
+        cursor.executemany(INSERT_FLAG_SQL, [(flag,) for flag in new_flags])
+        known_flags.update(new_flags)
+
+
+# Files per extraction task; each task runs at most one otool process
+EXTRACT_BATCH = 64
+
+# Extraction tasks in flight at once. The next batch is only submitted once
+# a finished one has been queued to the writer, so a slow writer holds back
+# the workers instead of letting their results pile up in memory
+EXTRACT_WORKERS = os.cpu_count() or 1
+EXTRACT_IN_FLIGHT = 2 * EXTRACT_WORKERS
+
+
+def extract(file_paths):
+    """
+    Gather the Mach-O headers, ARM64 instructions and load commands of a batch
+    of files, returned as one (headers, instructions, load commands) tuple per
+    file. Pure function with no database access, so it can run in a worker process.
+    """
+    parsed = [parse_mach_o(file_path) for file_path in file_paths]
+
+    # Only disassemble the files that have an ARM64 slice
+    arm64_paths = [
+        file_path
+        for file_path, (header_list, _) in zip(file_paths, parsed)
+        if any(header[1] == CPU_TYPE_ARM64 for header in header_list)
+    ]
+    arm64_instructions = get_arm64_instructions(arm64_paths)
+
+    return [
+        (header_list, arm64_instructions.get(file_path, []), load_cmds)
+        for file_path, (header_list, load_cmds) in zip(file_paths, parsed)
+    ]
+
+
+# `binary` and `binary_header` rows are buffered across files and written
+# with executemany once BATCH_SIZE rows are pending. Binary ids are handed out
+# here rather than read back from lastrowid, so children can reference them
+# before their parent row is flushed.
+BATCH_SIZE = 5000
+binary_rows = []
+header_rows = []
+next_binary_id = None
+
+# The scan runs in one explicit transaction, committed every COMMIT_INTERVAL
+# inserted rows so the WAL stays bounded
+COMMIT_INTERVAL = 10000
+rows_since_commit = 0
+
+
+def flush_rows():
+    """
+    Write the buffered `binary` and `binary_header` rows.
+    """
+    cursor.executemany(INSERT_BINARY_SQL, binary_rows)
+    cursor.executemany(INSERT_HEADER_SQL, header_rows)
+    binary_rows.clear()
+    header_rows.clear()
+
+
+def commit():
+    """
+    Flush the buffered rows and commit the current transaction.
+    """
+    flush_rows()
+    cursor.execute("COMMIT")
+
+
+def process_file(file_path, header_list, arm64_instructions, load_cmds):
+    """
+    Queue the file path for `binary` and the extracted Mach-O header data for
+    `binary_header`, and store its ARM64 instructions and load commands.
+    """
+    global next_binary_id, rows_since_commit
+
+    # Reserve the binary's id past the highest one already stored
+    if next_binary_id is None:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM binary")
+        next_binary_id = cursor.fetchone()[0]
+    binary_id = next_binary_id
+    next_binary_id += 1
+
+    # Queue path for `binary` table and Mach-O header info for `binary_header`
+    binary_rows.append((binary_id, file_path))
+    header_rows.extend(
+        (binary_id, magic, cputype, cpusubtype, caps, filetype, ncmds, sizeofcmds, flags)
+        for (magic, cputype, cpusubtype, caps, filetype, ncmds, sizeofcmds, flags) in header_list
+    )
+    if len(binary_rows) >= BATCH_SIZE or len(header_rows) >= BATCH_SIZE:
+        flush_rows()
+    store_flags(header_list)
+
+    # Store ARM64 instructions (if applicable)
     if arm64_instructions:
         store_arm64_instructions(binary_id, arm64_instructions)
 
-    # NEW: Harvest load commands
-    load_cmds = get_load_commands(file_path)
+    # NEW: Store load commands
     if load_cmds:
         store_load_commands(binary_id, load_cmds)
 
+    rows_since_commit += 1 + len(header_list) + len(arm64_instructions) + len(load_cmds)
+    if rows_since_commit >= COMMIT_INTERVAL:
+        commit()
+        cursor.execute("BEGIN IMMEDIATE")
+        rows_since_commit = 0
+
+
+# Extracted files waiting for the writer thread; once it is full, handing
+# over results blocks until the writer catches up
+WRITE_QUEUE_SIZE = 4096
+
+
+def write_results(results):
+    """
+    Writer thread: store every (path, headers, instructions, load commands)
+    tuple taken from the results queue until a None sentinel arrives. All
+    database writes of a scan happen on this one thread.
+    """
+    try:
+        for item in iter(results.get, None):
+            process_file(*item)
+    except BaseException:
+        # Keep draining so the producer never blocks on a full queue
+        for _ in iter(results.get, None):
+            pass
+        raise
+    # Outside the try: the sentinel is consumed, so there is nothing to drain
+    flush_rows()
+
+
+# (st_dev, st_ino) of every file queued so far, so hard-linked copies of a
+# binary, or directories given twice, are only harvested once
+seen_files = set()
+
 
 def walk_directory(root_dir):
     """
-    Recursively walk the specified directory, identify Mach-O files,
-    and process them.
+    Recursively walk the specified directory, identify Mach-O files on a
+    thread pool, and process them. Extraction is fanned out over a process pool,
+    and the results are queued to a single writer thread, which stores them
+    inside the caller's transaction.
     """
-    for dirpath, dirnames, filenames in os.walk(root_dir, followlinks=False):
-        for filename in filenames:
-            file_path = os.path.join(dirpath, filename)
-            # Skip broken symlinks or unreadable files
-            if not os.path.isfile(file_path):
-                continue
+    paths = []
+    entries = iter_files(root_dir)
+    with ThreadPoolExecutor(max_workers=SNIFF_WORKERS) as sniffers:
+        while True:
+            batch = list(islice(entries, SNIFF_BATCH))
+            if not batch:
+                break
+            for entry in sniffers.map(sniff, batch):
+                if entry is None:
+                    continue
+                # sniff already stat'ed the entry, so this is served from its cache
+                stat = entry.stat(follow_symlinks=False)
+                key = (stat.st_dev, stat.st_ino)
+                if key not in seen_files:
+                    seen_files.add(key)
+                    paths.append(entry.path)
 
-            if is_mach_o(file_path):
-                process_file(file_path)
+    batches = (paths[i:i + EXTRACT_BATCH] for i in range(0, len(paths), EXTRACT_BATCH))
+    results = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    with ThreadPoolExecutor(max_workers=1) as writer_pool:
+        writer = writer_pool.submit(write_results, results)
+        try:
+            # Spawn rather than fork the workers: this process already runs
+            # the writer thread and holds the SQLite connection
+            with ProcessPoolExecutor(max_workers=EXTRACT_WORKERS,
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                pending = {
+                    executor.submit(extract, batch): batch
+                    for batch in islice(batches, EXTRACT_IN_FLIGHT)
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch = pending.pop(future)
+                        # Blocks while the writer's queue is full
+                        for file_path, result in zip(batch, future.result()):
+                            results.put((file_path, *result))
+                        for batch in islice(batches, 1):
+                            pending[executor.submit(extract, batch)] = batch
+        finally:
+            results.put(None)
+        writer.result()
 
 
 def main():
@@ -312,14 +1028,31 @@ def main():
         default=["/sbin/"],
         help="One or more directories to scan. If none are specified, defaults to /sbin/."
     )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Build the database in memory and write it to disk once the scan is done."
+    )
     args = parser.parse_args()
+    if args.memory and sqlite3.sqlite_version_info < (3, 27, 0):
+        parser.error(f"--memory needs SQLite 3.27 or newer for VACUUM INTO (found {sqlite3.sqlite_version})")
+
+    init_db(in_memory=args.memory)
 
     # Process each directory in the list
+    cursor.execute("BEGIN IMMEDIATE")
     for directory in args.directories:
         if os.path.isdir(directory):
             walk_directory(directory)
         else:
             print(f"Warning: {directory} is not a valid directory or not accessible.")
+    commit()
+
+    # Index only after the bulk load
+    create_indexes()
+
+    if args.memory:
+        save_db()
 
     # Close DB
     conn.close()